@@ -4,4 +4,5 @@ setup(
     name="remarkable-file-mover",
     version="0.1",
     packages=find_packages(),
+    python_requires=">=3.10",
 )
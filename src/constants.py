@@ -9,7 +9,10 @@ CONFIG_PATH = CONFIG_DIR / "remarkable_config.txt"
 IMAGE_CONFIG_PATH = CONFIG_DIR / "image_config.yaml"
 TEXT_OVERLAY_IMAGE_DIR = ROOT_DIR / "text_overlay_images"
 
-IMG_POSITIONS = ["center", "left", "right", "top", "bottom"]
+# frozenset since it is checked for every file of a batch directory
+IMG_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png"})
+
+IMG_POSITIONS = ("center", "left", "right", "top", "bottom")
 
 IMG_POSITIONS_HELP = (
     "Position to crop from. Options:\n"
@@ -21,7 +24,7 @@ IMG_POSITIONS_HELP = (
     "(default: center)"
 )
 
-TEXT_POSITIONS = [
+TEXT_POSITIONS = (
     "upper_left",
     "upper_middle",
     "upper_right",
@@ -31,7 +34,7 @@ TEXT_POSITIONS = [
     "lower_left",
     "lower_middle",
     "lower_right",
-]
+)
 
 TEXT_POSITIONS_HELP = (
     "Position to add text overlay image to. Options:\n"
@@ -41,3 +44,23 @@ TEXT_POSITIONS_HELP = (
     "Combine with underscore like (upper_left, middle_middle, lower_middle, etc)\n"
     "(default: lower_right)"
 )
+
+RESAMPLE_FILTERS = ("bicubic", "lanczos", "bilinear")
+
+RESAMPLE_FILTERS_HELP = (
+    "Resampling filter used to resize the image. Options:\n"
+    "  - bicubic:  fast, visually the same as lanczos for most photos\n"
+    "  - lanczos:  slowest, sharpest for very large downscales\n"
+    "  - bilinear: fastest, lower quality\n"
+    "(default: bicubic)"
+)
+
+BACKENDS = ("pillow", "vips")
+
+BACKENDS_HELP = (
+    "Library used to load, crop and resize the image. Options:\n"
+    "  - pillow\n"
+    "  - vips: streams the image, uses less memory for very large images\n"
+    "          (needs pyvips, see README)\n"
+    "(default: pillow)"
+)
@@ -1,18 +1,174 @@
 """Move a file to a destination and rename it to 'suspended.png'"""
 
 import argparse
+import errno
 import os
-import shutil
+import sys
 from pathlib import Path
 
 from src.constants import CONFIG_PATH
 from src.utils import (ConfigKey, MoveConfig, ProtectedFile,
                        add_move_file_args, get_config_path)
 
+# Size of each chunk copied by the copy loops
+COPY_BUFSIZE = 1 << 20
+
+# Smallest and largest buffer used by the read / write copy loop
+_MIN_READINTO_BUFSIZE = 64 << 10
+_MAX_READINTO_BUFSIZE = 8 << 20
+
+# Errors meaning the fast copy syscall can not be used for these files
+_FAST_COPY_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.ENOSYS,
+    errno.EINVAL,
+    errno.EOPNOTSUPP,
+    errno.EBADF,
+}
+
+
+def _copy_file_range(src_fd: int, dst_fd: int) -> bool:
+    """Copy a file with os.copy_file_range, which lets the kernel (or the
+    file system, for CoW / network file systems) copy the data without
+    passing it through user space.
+
+    Args:
+        src_fd (int): Source file descriptor.
+        dst_fd (int): Destination file descriptor.
+
+    Raises:
+        OSError: Raised if the copy fails part way through.
+
+    Returns:
+        bool: True if the file was copied, False if copy_file_range can not
+            be used and nothing was copied.
+    """
+    if not hasattr(os, "copy_file_range"):
+        return False
+    copied = 0
+    try:
+        while True:
+            n_bytes = os.copy_file_range(src_fd, dst_fd, COPY_BUFSIZE)
+            if n_bytes == 0:
+                return True
+            copied += n_bytes
+    except OSError as e:
+        if copied == 0 and e.errno in _FAST_COPY_UNSUPPORTED:
+            return False
+        raise
+
+
+def _sendfile(src_fd: int, dst_fd: int) -> bool:
+    """Copy a file with os.sendfile, which copies the data inside the kernel.
+
+    Args:
+        src_fd (int): Source file descriptor.
+        dst_fd (int): Destination file descriptor.
+
+    Raises:
+        OSError: Raised if the copy fails part way through.
+
+    Returns:
+        bool: True if the file was copied, False if sendfile can not be used
+            and nothing was copied.
+    """
+    # outside of Linux, sendfile can only write to a socket
+    if not hasattr(os, "sendfile") or not sys.platform.startswith("linux"):
+        return False
+    offset = 0
+    try:
+        while True:
+            n_bytes = os.sendfile(dst_fd, src_fd, offset, COPY_BUFSIZE)
+            if n_bytes == 0:
+                return True
+            offset += n_bytes
+    except OSError as e:
+        if offset == 0 and e.errno in _FAST_COPY_UNSUPPORTED:
+            return False
+        raise
+
+
+def _readinto_copy(src_fd: int, dst_fd: int) -> None:
+    """Copy a file by reading into a single reused buffer and writing it out.
+    The buffer is sized to the file (between 64 KiB and 8 MiB), so most
+    images are copied with a single read and write.
+
+    Args:
+        src_fd (int): Source file descriptor.
+        dst_fd (int): Destination file descriptor.
+    """
+    file_size = os.fstat(src_fd).st_size
+    buffer = bytearray(
+        min(max(file_size, _MIN_READINTO_BUFSIZE), _MAX_READINTO_BUFSIZE)
+    )
+    view = memoryview(buffer)
+    with open(src_fd, "rb", buffering=0, closefd=False) as src_file, open(
+        dst_fd, "wb", buffering=0, closefd=False
+    ) as dst_file:
+        while True:
+            n_bytes = src_file.readinto(buffer)
+            if not n_bytes:
+                break
+            # unbuffered writes can write less than they are given
+            chunk = view[:n_bytes]
+            while chunk:
+                chunk = chunk[dst_file.write(chunk) :]
+
+
+def fast_copy(
+    source_path: Path, destination_path: Path, is_overwritable: bool = True
+) -> None:
+    """Copy a file and its metadata (like shutil.copy2), using the fastest
+    copy available: copy_file_range, then sendfile, then a read / write loop
+    with a large reused buffer.
+
+    Args:
+        source_path (Path): Source file path.
+        destination_path (Path): Destination file path.
+        is_overwritable (bool, optional): If False, raise an exception if
+            the destination exists. The check is done by the same call that
+            creates the destination, so there is no gap between the two.
+            Defaults to True.
+
+    Raises:
+        ProtectedFile: Raise if the destination exists and `is_overwritable`
+            = False.
+        shutil.SameFileError: Raise if the source and destination are the
+            same file, which would otherwise be truncated.
+    """
+    if destination_path.exists() and os.path.samefile(source_path, destination_path):
+        import shutil
+
+        raise shutil.SameFileError(
+            f"{source_path} and {destination_path} are the same file"
+        )
+    binary_flag = getattr(os, "O_BINARY", 0)
+    dst_flags = os.O_WRONLY | os.O_CREAT | binary_flag
+    dst_flags |= os.O_TRUNC if is_overwritable else os.O_EXCL
+    src_fd = os.open(source_path, os.O_RDONLY | binary_flag)
+    try:
+        try:
+            dst_fd = os.open(destination_path, dst_flags, 0o644)
+        except FileExistsError as e:
+            raise ProtectedFile(file_path=destination_path) from e
+        try:
+            if not (_copy_file_range(src_fd, dst_fd) or _sendfile(src_fd, dst_fd)):
+                _readinto_copy(src_fd, dst_fd)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    # shutil is imported lazily, it is only needed for copystat
+    import shutil
+
+    shutil.copystat(source_path, destination_path)
+
 
 def move_file(source_path: Path, move_config: MoveConfig) -> None:
     """Move a source file (full file path) to a destination
-    (full file path).
+    (full file path). The source file is copied unless `keep_source` = False,
+    in which case it is renamed when the source and destination are on the
+    same file system (and copied then removed otherwise).
 
     Args:
         source_path (Path): Source file path.
@@ -22,20 +178,39 @@ def move_file(source_path: Path, move_config: MoveConfig) -> None:
         ProtectedFile: Raise if a file exists and `is_overwritable` = False
             to prevent it from being overwritten.
     """
-    # unpack dataclass
-    destination_path = move_config.destination_path
+    # unpack dataclass, paths can be passed in as strings from the command line
+    source_path = Path(source_path)
+    destination_path = Path(move_config.destination_path)
     is_overwritable = move_config.is_overwritable
+    keep_source = move_config.keep_source
 
-    if not is_overwritable and os.path.exists(destination_path):
+    # copying checks for an existing file when it creates the destination
+    if not keep_source and not is_overwritable and destination_path.exists():
         raise ProtectedFile(file_path=destination_path)
     try:
         # Create the destination directory if it doesn't exist
-        os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+        destination_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Copy the file, overwriting if it exists
-        shutil.copy2(source_path, destination_path)
+        if keep_source:
+            fast_copy(
+                source_path=source_path,
+                destination_path=destination_path,
+                is_overwritable=is_overwritable,
+            )
+        else:
+            try:
+                # Renaming only updates the directory entries, no data is copied
+                os.replace(source_path, destination_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                # Source and destination are on different file systems
+                fast_copy(source_path=source_path, destination_path=destination_path)
+                os.remove(source_path)
         print(f"Successfully moved {source_path} to {destination_path}")
 
+    except ProtectedFile:
+        raise
     except Exception as e:
         print(f"Error moving file: {str(e)}")
 
@@ -56,6 +231,7 @@ def main():
     )
     move_config.destination_path = destination_path
     move_config.is_overwritable = args.overwrite
+    move_config.keep_source = not args.move
     move_file(source_path=source_path, move_config=move_config)
 
 
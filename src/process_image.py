@@ -1,22 +1,58 @@
 """Process an image to set dimension by cropping, resizing, and adding an optional border."""
 
+from __future__ import annotations
+
 import argparse
+import os
+import sys
+from dataclasses import replace
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Literal
-
-from PIL import Image as PILImage
+from typing import TYPE_CHECKING, Iterator, List, Literal, Optional, Tuple
 
 from src.utils import (
-    CoordinateDict,
-    DimensionsDict,
+    Coordinates,
+    Dimensions,
     ProcessConfig,
     TextPosition,
     add_process_image_args,
     get_image_dimensions_from_config,
+    get_image_paths,
     load_image_config,
     update_processconfig_from_args,
 )
 
+# PIL is imported inside the functions that use it so the script starts (and
+# prints --help / argument errors) without paying for the PIL import
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from threading import BoundedSemaphore
+
+    from PIL import Image as PILImage
+
+# Crop offset of each crop position in halves of the cropped off width / height.
+# Positions that do not apply to the cropped direction use the center (1).
+_HORIZONTAL_CROP_OFFSETS = {"left": 0, "center": 1, "right": 2}
+_VERTICAL_CROP_OFFSETS = {"top": 0, "center": 1, "bottom": 2}
+
+# Column (left, middle, right) and row (upper, middle, lower) of each text
+# position
+_TEXT_POSITION_ANCHORS = {
+    TextPosition.UPPER_LEFT: (0, 0),
+    TextPosition.UPPER_MIDDLE: (1, 0),
+    TextPosition.UPPER_RIGHT: (2, 0),
+    TextPosition.MIDDLE_LEFT: (0, 1),
+    TextPosition.MIDDLE_MIDDLE: (1, 1),
+    TextPosition.MIDDLE_RIGHT: (2, 1),
+    TextPosition.LOWER_LEFT: (0, 2),
+    TextPosition.LOWER_MIDDLE: (1, 2),
+    TextPosition.LOWER_RIGHT: (2, 2),
+}
+
+# Lookup table for Image.point that inverts the RGB bands of an RGBA image and
+# keeps the alpha band
+_INVERT_RGB_LUT = [255 - value for value in range(256)] * 3 + list(range(256))
+
 
 def load_image(image_path: Path) -> PILImage:
     """Load a PILImage from a path.
@@ -27,6 +63,8 @@ def load_image(image_path: Path) -> PILImage:
     Returns:
         PILImage: Image array.
     """
+    from PIL import Image as PILImage
+
     return PILImage.open(image_path)
 
 
@@ -48,80 +86,84 @@ def get_processed_output_path(
     """
     if isinstance(input_path, str):
         input_path = Path(input_path)
-    return input_path.with_name(input_path.stem + appended_txt + input_path.suffix)
+    return input_path.with_stem(input_path.stem + appended_txt)
 
 
-def add_border(
-    image: PILImage, border_width: int, final_image_dims: DimensionsDict
-) -> PILImage:
+def add_border(image: PILImage, border_width: int) -> PILImage:
     """Add a white border to a resized / processed image. The `border_width` will
-    be the same for the height and with border lines.
+    be the same for the height and with border lines, so the bordered image is
+    `2 * border_width` larger than `image` in both dimensions. The image is
+    pasted once onto a white RGB canvas of the final size, which also
+    converts it to RGB (compositing transparent images onto white), so no
+    separate conversion pass is needed.
 
     Args:
         image (PILImage): PIL Image that has been resized / processed.
         border_width (int): Width of border in pixels.
-        final_image_dims (DimensionsDict): Final image dimensions dict.
 
     Returns:
-        Image: Resized / processed image with a white border.
+        Image: Resized / processed RGB image with a white border.
     """
+    from PIL import Image as PILImage
+    from PIL import ImageOps
+
     # Do not add a border if it is not > 0
     if border_width <= 0:
-        return image
-
-    # Create new image with target dimensions
-    bordered = PILImage.new(
-        "RGB", (final_image_dims["width"], final_image_dims["height"]), "white"
+        return convert_to_rgb(img=image)
+    if image.mode == "RGB":
+        # nothing to convert, let Pillow fill and copy in C
+        return ImageOps.expand(image, border=border_width, fill="white")
+
+    width, height = image.size
+    canvas = PILImage.new(
+        "RGB", (width + 2 * border_width, height + 2 * border_width), "white"
     )
-
-    # Calculate position to paste the image (these are the same values)
-    x_value = border_width
-    y_value = border_width
-
-    # Paste the image
-    bordered.paste(image, (x_value, y_value))
-
-    return bordered
+    if "A" in image.mode or "transparency" in image.info:
+        image = image.convert("RGBA")
+        canvas.paste(image, (border_width, border_width), mask=image)
+    else:
+        # paste converts other modes to RGB as it copies
+        canvas.paste(image, (border_width, border_width))
+    return canvas
 
 
 def get_dimensions(
-    image_dims: DimensionsDict,
+    image_dims: Dimensions,
     border_width: int = None,
-) -> DimensionsDict:
+) -> Dimensions:
     """Get image dimenions for image depending on if a border is
     being added.
 
     Args:
-        image_dims (DimensionsDict): Image dimension dict.
+        image_dims (Dimensions): Image dimensions.
         border_width (int, optional): Border width.
             Defaults to None.
 
     Returns:
-        DimensionsDict: Dict of "width" and "height" values.
+        Dimensions: Width and height values.
     """
     # If border is specified, adjust target dimensions for initial resize
     if border_width is not None:
-        resize_width = image_dims["width"] - (2 * border_width)
-        resize_height = image_dims["height"] - (2 * border_width)
+        resize_width = image_dims.width - (2 * border_width)
+        resize_height = image_dims.height - (2 * border_width)
     else:
-        resize_width = image_dims["width"]
-        resize_height = image_dims["height"]
-    return DimensionsDict(width=resize_width, height=resize_height)
+        resize_width = image_dims.width
+        resize_height = image_dims.height
+    return Dimensions(width=resize_width, height=resize_height)
 
 
 def get_text_position(
-    background_image_dims: DimensionsDict,
-    text_image_dims: DimensionsDict,
+    background_image_dims: Dimensions,
+    text_image_dims: Dimensions,
     position: TextPosition,
     image_position_buffer: int = 0,
-) -> CoordinateDict:
+) -> Coordinates:
     """Get x and y coords for text overlay relative to desired
     position on background image.
 
     Args:
-        background_image_dims (DimensionsDict): Background image dimensions
-            dict.
-        text_image_dims (DimensionsDict): Text image dimensions dict.
+        background_image_dims (Dimensions): Background image dimensions.
+        text_image_dims (Dimensions): Text image dimensions.
         position (TextPosition): TextPosition enum.
         image_position_buffer (int, optional): Buffer for the image position
             in pixels.
@@ -132,36 +174,26 @@ def get_text_position(
             Defaults to 0.
 
     Returns:
-       CoordinateDict: x, y coords for pasting text overlay.
+       Coordinates: x, y coords for pasting text overlay.
     """
-    x_left = image_position_buffer
-    x_right = (
-        background_image_dims["width"]
-        - text_image_dims["width"]
-        - image_position_buffer
-    )
-    # Calculate center x-position
-    x_middle = (background_image_dims["width"] - text_image_dims["width"]) // 2
-
-    y_upper_base = 0
-    y_middle = (background_image_dims["height"] - text_image_dims["height"]) // 2
-    y_lower_base = background_image_dims["height"] - text_image_dims["height"]
-
-    y_upper = y_upper_base + image_position_buffer
-    y_lower = y_lower_base - image_position_buffer
-
-    position_coords = {
-        TextPosition.UPPER_LEFT: CoordinateDict(x=x_left, y=y_upper),
-        TextPosition.UPPER_MIDDLE: CoordinateDict(x=x_middle, y=y_upper),
-        TextPosition.UPPER_RIGHT: CoordinateDict(x=x_right, y=y_upper),
-        TextPosition.MIDDLE_LEFT: CoordinateDict(x=x_left, y=y_middle),
-        TextPosition.MIDDLE_MIDDLE: CoordinateDict(x=x_middle, y=y_middle),
-        TextPosition.MIDDLE_RIGHT: CoordinateDict(x=x_right, y=y_middle),
-        TextPosition.LOWER_LEFT: CoordinateDict(x=x_left, y=y_lower),
-        TextPosition.LOWER_MIDDLE: CoordinateDict(x=x_middle, y=y_lower),
-        TextPosition.LOWER_RIGHT: CoordinateDict(x=x_right, y=y_lower),
-    }
-    return position_coords[position]
+    column, row = _TEXT_POSITION_ANCHORS[position]
+    free_width = background_image_dims.width - text_image_dims.width
+    free_height = background_image_dims.height - text_image_dims.height
+
+    # left / upper move in by the buffer, right / lower move in the other way
+    if column == 0:
+        x = image_position_buffer
+    elif column == 1:
+        x = free_width // 2
+    else:
+        x = free_width - image_position_buffer
+    if row == 0:
+        y = image_position_buffer
+    elif row == 1:
+        y = free_height // 2
+    else:
+        y = free_height - image_position_buffer
+    return Coordinates(x=x, y=y)
 
 
 def invert_text_color(image: PILImage) -> PILImage:
@@ -174,18 +206,8 @@ def invert_text_color(image: PILImage) -> PILImage:
     Returns:
         image with inverted colors but same transparency.
     """
-    # Split into RGBA channels
-    r, g, b, a = image.split()
-
-    # Create inverted RGB channels (255 - original)
-    r_inv = PILImage.eval(r, lambda x: 255 - x)
-    g_inv = PILImage.eval(g, lambda x: 255 - x)
-    b_inv = PILImage.eval(b, lambda x: 255 - x)
-
-    # Merge back together with original alpha
-    inverted = PILImage.merge("RGBA", (r_inv, g_inv, b_inv, a))
-
-    return inverted
+    # one pass over all bands: RGB through the inverting table, alpha unchanged
+    return image.point(_INVERT_RGB_LUT)
 
 
 def overlay_text_image(
@@ -193,6 +215,7 @@ def overlay_text_image(
     text_img: PILImage,
     position: TextPosition,
     image_buffer: int,
+    inplace: bool = False,
 ) -> PILImage:
     """Overlay text image onto a background image in the specified
     position.
@@ -202,41 +225,62 @@ def overlay_text_image(
         text_img (PILImage): Text overlay image (PNG with transparency)
         position (TextPosition): Position to place text from TextPosition enum.
         image_buffer (int): buffer in pixels for image padding.
+        inplace (bool, optional): Paste onto `processed_img` itself instead of
+            a copy, for callers that don't need the image without the text.
+            Defaults to False.
 
     Returns:
         PIL Image with text overlaid.
     """
-    background_dims_dict = DimensionsDict(
+    background_dims_dict = Dimensions(
         width=processed_img.size[0], height=processed_img.size[1]
     )
-    text_dims_dict = DimensionsDict(width=text_img.size[0], height=text_img.size[1])
+    text_dims_dict = Dimensions(width=text_img.size[0], height=text_img.size[1])
 
     # Get position coordinates
-    coord_dict = get_text_position(
+    coords = get_text_position(
         background_image_dims=background_dims_dict,
         text_image_dims=text_dims_dict,
         position=position,
         image_position_buffer=image_buffer,
     )
 
-    # Get alpha channel for mask
-    alpha_mask = text_img.split()[3]
-
     # Create a copy of background to modify
-    result = processed_img.copy()
+    result = processed_img if inplace else processed_img.copy()
 
-    # Paste text overlay
-    result.paste(text_img, (coord_dict["x"], coord_dict["y"]), mask=alpha_mask)
+    # Paste text overlay, an RGBA mask uses its alpha channel so there is no
+    # need to split it out
+    result.paste(text_img, coords, mask=text_img)
 
     return result
 
 
-def crop_image(
-    img: PILImage,
-    resized_dimensions_dict: DimensionsDict,
+def draft_image(img: PILImage, resized_dimensions_dict: Dimensions) -> None:
+    """Let libjpeg downscale a JPEG image while decoding it. The image is
+    decoded at a reduced scale no smaller than twice the resized dimensions,
+    which skips decoding detail that would be thrown away by the resize.
+    This only has an effect on JPEG images that have not been loaded yet.
+
+    Args:
+        img (PILImage): PILImage object.
+        resized_dimensions_dict (Dimensions): Resized width and height.
+    """
+    if img.format == "JPEG":
+        img.draft(
+            "RGB",
+            (
+                resized_dimensions_dict.width * 2,
+                resized_dimensions_dict.height * 2,
+            ),
+        )
+
+
+def get_crop_box(
+    image_size: Tuple[int, int],
+    resized_dimensions_dict: Dimensions,
     crop_position: Literal["center", "left", "right", "top", "bottom"] = "center",
-) -> PILImage:
-    """Crop an image to the ratio of the target dimensions.
+) -> Tuple[int, int, int, int]:
+    """Get the crop box of an image for the ratio of the target dimensions.
     Uses the border width to get the right dimensions. Can pass `crop_position`
     to determine what part of the image kept in the final crop.
 
@@ -247,74 +291,203 @@ def crop_image(
     Etc...
 
     Args:
-        img (PILImage): PILImage object.
-        resized_dimensions_dict (DimensionsDict): Dict of resized width and height.
+        image_size (Tuple[int, int]): Image size (width, height).
+        resized_dimensions_dict (Dimensions): Resized width and height.
         crop_position (Literal["center", "left", "right", "top", "bottom"], optional): Determine
             where to crop the image relative to.
             Defaults to "center".
 
     Returns:
-        PILImage: Cropped image.
+        Tuple[int, int, int, int]: (left, top, right, bottom) crop box.
     """
-    # Calculate resized aspect ratio
-    resized_target_ratio = (
-        resized_dimensions_dict["width"] / resized_dimensions_dict["height"]
-    )
-
-    # Calculate current image aspect ratio
-    width, height = img.size
-    current_ratio = width / height
+    resized_width, resized_height = resized_dimensions_dict
+    width, height = image_size
 
-    # Calculate dimensions for cropping
-    if current_ratio > resized_target_ratio:
+    # Calculate dimensions for cropping. The aspect ratios are compared by
+    # cross multiplying so everything stays in integer math.
+    if width * resized_height > height * resized_width:
         # Image is wider than target ratio
-        new_width = int(height * resized_target_ratio)
+        new_width = height * resized_width // resized_height
         new_height = height
         # Calculate crop position
-        if crop_position == "left":
-            left = 0
-        elif crop_position == "right":
-            left = width - new_width
-        else:  # center
-            left = (width - new_width) // 2
+        left = (width - new_width) * _HORIZONTAL_CROP_OFFSETS.get(crop_position, 1) // 2
         top = 0
         right = left + new_width
         bottom = height
     else:
         # Image is taller than target ratio
         new_width = width
-        new_height = int(width / resized_target_ratio)
+        new_height = width * resized_height // resized_width
         left = 0
         # Calculate crop position
-        if crop_position == "top":
-            top = 0
-        elif crop_position == "bottom":
-            top = height - new_height
-        else:  # center
-            top = (height - new_height) // 2
+        top = (height - new_height) * _VERTICAL_CROP_OFFSETS.get(crop_position, 1) // 2
         right = width
         bottom = top + new_height
 
-    # Crop the image
-    cropped = img.crop((left, top, right, bottom))
+    return left, top, right, bottom
 
-    return cropped
 
+def crop_image(
+    img: PILImage,
+    resized_dimensions_dict: Dimensions,
+    crop_position: Literal["center", "left", "right", "top", "bottom"] = "center",
+) -> PILImage:
+    """Crop an image to the ratio of the target dimensions. See `get_crop_box`.
 
-def resize_image(cropped_img: PILImage, resized_dim_dict: DimensionsDict) -> PILImage:
-    """Resize the image to the intended final dimensions.
+    Args:
+        img (PILImage): PILImage object.
+        resized_dimensions_dict (Dimensions): Resized width and height.
+        crop_position (Literal["center", "left", "right", "top", "bottom"], optional): Determine
+            where to crop the image relative to.
+            Defaults to "center".
+
+    Returns:
+        PILImage: Cropped image, `img` itself if it already has the ratio of
+            the target dimensions.
+    """
+    draft_image(img=img, resized_dimensions_dict=resized_dimensions_dict)
+    crop_box = get_crop_box(
+        image_size=img.size,
+        resized_dimensions_dict=resized_dimensions_dict,
+        crop_position=crop_position,
+    )
+    if crop_box == (0, 0, *img.size):
+        # nothing to crop off, don't copy the image
+        return img
+    return img.crop(crop_box)
+
+
+def get_resample_filter(resample: str) -> int:
+    """Get the PIL resampling filter from its name.
+
+    Args:
+        resample (str): Resampling filter name, ex: "bicubic".
+
+    Returns:
+        int: PIL resampling filter.
+    """
+    from PIL import Image as PILImage
+
+    # Older Pillow-SIMD releases predate the Resampling enum
+    resampling = getattr(PILImage, "Resampling", PILImage)
+    return getattr(resampling, resample.upper())
+
+
+def resize_image(
+    img: PILImage,
+    resized_dim_dict: Dimensions,
+    box: Optional[Tuple[int, int, int, int]] = None,
+    resample: Literal["bicubic", "lanczos", "bilinear"] = "bicubic",
+    reducing_gap: Optional[float] = 3.0,
+) -> PILImage:
+    """Resize the image to the intended final dimensions. If a crop `box` is
+    passed, only that region is resized, which crops and resizes in a single
+    pass without creating an intermediate cropped image.
+
+    For large downscales, `reducing_gap` first shrinks the image with a fast
+    box reduction to at least `reducing_gap` times the final size, so the
+    slower `resample` filter only runs on the smaller image.
+
+    Args:
+        img (PILImage): Image to resize.
+        resized_dim_dict (Dimensions): Resized width and height.
+        box (Tuple[int, int, int, int], optional): (left, top, right, bottom)
+            region of `img` to resize.
+            Defaults to None (the whole image).
+        resample (Literal["bicubic", "lanczos", "bilinear"], optional): Resampling
+            filter. Defaults to "bicubic".
+        reducing_gap (float, optional): Reduction gap, None to resample the
+            full size image.
+            Defaults to 3.0.
+
+    Returns:
+        PILImage: Resized image, `img` itself (or the cropped `box` region) if
+            it is already at the resized dimensions.
+    """
+    target_size = tuple(resized_dim_dict)
+    if box is None or box == (0, 0, *img.size):
+        if img.size == target_size:
+            return img
+    elif (box[2] - box[0], box[3] - box[1]) == target_size:
+        # only a crop is needed, skip resampling
+        return img.crop(box)
+    return img.resize(
+        resized_dim_dict,
+        get_resample_filter(resample=resample),
+        box=box,
+        reducing_gap=reducing_gap,
+    )
+
+
+def load_and_resize_vips(
+    image_path: Path,
+    resized_dim_dict: Dimensions,
+    crop_position: Literal["center", "left", "right", "top", "bottom"] = "center",
+) -> PILImage:
+    """Load, crop and resize an image with pyvips. pyvips streams the image
+    through the pipeline instead of decoding all of it into memory first,
+    which keeps memory use low for very large images.
 
     Args:
-        cropped_img (PILImage): Cropped Image.
-        resized_dim_dict (DimensionsDict): Dict with resized width and height.
+        image_path (Path): Path of image file.
+        resized_dim_dict (Dimensions): Resized width and height.
+        crop_position (Literal["center", "left", "right", "top", "bottom"], optional): Determine
+            where to crop the image relative to.
+            Defaults to "center".
+
+    Raises:
+        ImportError: Raised if pyvips or libvips is not installed.
 
     Returns:
-        PILImage: Resized image.
+        PILImage: Cropped and resized RGB image.
     """
-    return cropped_img.resize(
-        (resized_dim_dict["width"], resized_dim_dict["height"]),
-        PILImage.Resampling.LANCZOS,
+    from PIL import Image as PILImage
+
+    try:
+        import pyvips
+    except (ImportError, OSError) as e:
+        # OSError is raised when pyvips is installed but libvips is not
+        raise ImportError(
+            "The vips backend needs pyvips and libvips (see README)."
+        ) from e
+
+    img = pyvips.Image.new_from_file(str(image_path), access="sequential")
+    left, top, right, bottom = get_crop_box(
+        image_size=(img.width, img.height),
+        resized_dimensions_dict=resized_dim_dict,
+        crop_position=crop_position,
+    )
+    img = img.crop(left, top, right - left, bottom - top)
+    # crop="centre" trims any rounding difference so the size is exact
+    img = img.thumbnail_image(
+        resized_dim_dict.width, height=resized_dim_dict.height, crop="centre"
     )
+    if img.hasalpha():
+        img = img.flatten(background=[255, 255, 255])
+    img = img.colourspace("srgb").cast("uchar")
+
+    return PILImage.frombytes("RGB", (img.width, img.height), img.write_to_memory())
+
+
+def convert_to_rgb(img: PILImage) -> PILImage:
+    """Convert an image to RGB, skipping the conversion if it already is.
+    Transparent images are composited onto a white background.
+
+    Args:
+        img (PILImage): Image to convert.
+
+    Returns:
+        PILImage: RGB image.
+    """
+    from PIL import Image as PILImage
+
+    if img.mode == "RGB":
+        return img
+    if "A" in img.mode or "transparency" in img.info:
+        rgba_img = img.convert("RGBA")
+        background = PILImage.new("RGBA", rgba_img.size, "white")
+        return PILImage.alpha_composite(background, rgba_img).convert("RGB")
+    return img.convert("RGB")
 
 
 def save_image(processed_img: PILImage, output_path: Path) -> None:
@@ -324,10 +497,100 @@ def save_image(processed_img: PILImage, output_path: Path) -> None:
         processed_img (PILImage): Processed image.
         output_path (Path): File path to save file to.
     """
-    processed_img.save(output_path)
+    if Path(output_path).suffix.lower() in (".jpg", ".jpeg"):
+        # pin the encoder settings so the single pass encoder is always used
+        processed_img.save(
+            output_path,
+            format="JPEG",
+            quality=90,
+            optimize=False,
+            progressive=False,
+            subsampling="4:2:0",
+        )
+    elif Path(output_path).suffix.lower() == ".png":
+        # fastest zlib level, the default (6) takes several times longer to
+        # encode for a slightly smaller file
+        processed_img.save(output_path, format="PNG", compress_level=1)
+    else:
+        processed_img.save(output_path)
     print(f"Successfully processed image: {output_path}")
 
 
+@lru_cache(maxsize=8)
+def _prepare_text_overlay(
+    text_image_path: Path,
+    text_dims: Dimensions,
+    is_inverted: bool,
+    mtime_ns: int,
+    size: int,
+) -> PILImage:
+    """Load the text overlay image as RGBA, invert it if needed and crop /
+    resize it to the text overlay dimensions. Cached on the path, options,
+    modification time and size, so a batch using the same overlay only
+    decodes and resizes it once, and an edited overlay is loaded again.
+
+    Args:
+        text_image_path (Path): Path to text overlay image.
+        text_dims (Dimensions): Target dimensions of the text overlay image.
+        is_inverted (bool): Invert the text color.
+        mtime_ns (int): Modification time of the text overlay image, only
+            used as part of the cache key.
+        size (int): Size of the text overlay image in bytes, only used as
+            part of the cache key.
+
+    Returns:
+        PILImage: RGBA text overlay image.
+    """
+    text_img = load_image(text_image_path)
+    if text_img.mode == "RGBA":
+        # converting to the same mode would copy it, just decode it
+        text_img.load()
+    else:
+        text_img = text_img.convert("RGBA")
+    if is_inverted:
+        text_img = invert_text_color(image=text_img)
+    # check image size and only resize if needed
+    if not is_image_at_target_dims(
+        img=text_img, target_width=text_dims.width, target_height=text_dims.height
+    ):
+        print("resizing text overlay image...")
+        text_img = crop_image(img=text_img, resized_dimensions_dict=text_dims)
+        text_img = resize_image(
+            img=text_img, resized_dim_dict=text_dims, resample="bicubic"
+        )
+    return text_img
+
+
+def prepare_text_overlay(
+    text_image_path: Path,
+    text_dims: Dimensions,
+    is_inverted: bool = False,
+) -> PILImage:
+    """Load the text overlay image as RGBA, invert it if needed and crop /
+    resize it to the text overlay dimensions. The returned image is cached
+    and shared between calls, so it must not be modified. The overlay is
+    always resized with bicubic resampling, which is plenty for text,
+    whatever filter is used for the main image.
+
+    Args:
+        text_image_path (Path): Path to text overlay image.
+        text_dims (Dimensions): Target dimensions of the text overlay image.
+        is_inverted (bool, optional): Invert the text color.
+            Defaults to False.
+
+    Returns:
+        PILImage: RGBA text overlay image.
+    """
+    stat_result = os.stat(text_image_path)
+    return _prepare_text_overlay(
+        text_image_path=text_image_path,
+        text_dims=text_dims,
+        is_inverted=is_inverted,
+        mtime_ns=stat_result.st_mtime_ns,
+        size=stat_result.st_size,
+    )
+
+
 def is_image_at_target_dims(
     img: PILImage, target_width: int, target_height: int
 ) -> bool:
@@ -366,58 +629,62 @@ def process_image(
     is_inverted = process_config.is_inverted
     image_buffer = process_config.image_buffer
     text_position = process_config.text_position
+    resample = process_config.resample
+    backend = process_config.backend
 
     resized_dim_dict = get_dimensions(
         image_dims=final_image_dims,
         border_width=border_width,
     )
-    img = load_image(image_path=image_path)
-    cropped_img = crop_image(
-        img=img,
-        resized_dimensions_dict=resized_dim_dict,
-        crop_position=crop_position,
-    )
-
-    processed_img = resize_image(
-        cropped_img=cropped_img, resized_dim_dict=resized_dim_dict
-    )
-
-    if border_width is not None:
+    if backend == "vips":
+        processed_img = load_and_resize_vips(
+            image_path=image_path,
+            resized_dim_dict=resized_dim_dict,
+            crop_position=crop_position,
+        )
+    else:
+        img = load_image(image_path=image_path)
+        draft_image(img=img, resized_dimensions_dict=resized_dim_dict)
+        # decode once, at the draft scale / mode, before any pixel access
+        img.load()
+        crop_box = get_crop_box(
+            image_size=img.size,
+            resized_dimensions_dict=resized_dim_dict,
+            crop_position=crop_position,
+        )
 
-        processed_img = add_border(
-            image=processed_img,
-            border_width=border_width,
-            final_image_dims=final_image_dims,
+        # crop and resize in one pass
+        processed_img = resize_image(
+            img=img, resized_dim_dict=resized_dim_dict, box=crop_box, resample=resample
         )
+    # convert after resizing so there are fewer pixels to convert, the border
+    # is added in the same pass
+    if border_width is not None:
+        processed_img = add_border(image=processed_img, border_width=border_width)
+    else:
+        processed_img = convert_to_rgb(img=processed_img)
 
     # target dimensions for text overlay image
     text_img_width, text_img_height = get_image_dimensions_from_config(
         img_config=img_config, img_type="text_overlay"
     )
-    text_dim_dict = DimensionsDict(
+    text_dim_dict = Dimensions(
         width=text_img_width,
         height=text_img_height,
     )
     if text_image_path:
-        # load the text image
-        text_img = load_image(text_image_path).convert("RGBA")
-        if is_inverted:
-            text_img = invert_text_color(image=text_img)
-        # check image size and only resize if needed
-        if not is_image_at_target_dims(
-            img=text_img, target_width=text_img_width, target_height=text_img_height
-        ):
-            print("resizing text overlay image...")
-            text_img = crop_image(img=text_img, resized_dimensions_dict=text_dim_dict)
-            text_img = resize_image(
-                cropped_img=text_img, resized_dim_dict=text_dim_dict
-            )
-
+        text_img = prepare_text_overlay(
+            text_image_path=text_image_path,
+            text_dims=text_dim_dict,
+            is_inverted=is_inverted,
+        )
         processed_img = overlay_text_image(
             processed_img=processed_img,
             text_img=text_img,
             position=text_position,
             image_buffer=image_buffer,
+            # the processed image isn't used without the text
+            inplace=True,
         )
 
     if not save_path:
@@ -426,6 +693,114 @@ def process_image(
     save_image(processed_img=processed_img, output_path=save_path)
 
 
+def process_images(
+    process_configs: List[ProcessConfig], workers: Optional[int] = None
+) -> None:
+    """Process multiple images in parallel, one image per worker process.
+    An image that fails to process is reported and skipped.
+
+    Args:
+        process_configs (List[ProcessConfig]): ProcessConfig instance for
+            each image.
+        workers (int, optional): Number of worker processes.
+            Defaults to None (number of CPUs).
+    """
+    # imported here, concurrent.futures.process pulls in multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(process_image, process_config): process_config.image_path
+            for process_config in process_configs
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Error processing {futures[future]}: {str(e)}")
+
+
+def _read_stdin_image_paths() -> Iterator[Path]:
+    """Yield the image paths read from stdin, one path per line, until stdin
+    is closed. Blank lines and paths that were already read are skipped.
+
+    Yields:
+        Iterator[Path]: Image path.
+    """
+    seen = set()
+    for line in sys.stdin:
+        image_path = line.strip()
+        if not image_path:
+            continue
+        resolved_path = Path(image_path).resolve()
+        if resolved_path in seen:
+            continue
+        seen.add(resolved_path)
+        yield Path(image_path)
+
+
+def _report_stdin_result(
+    in_flight: BoundedSemaphore, image_path: Path, future: Future
+) -> None:
+    """Report an image from stdin that failed to process, as soon as it
+    finishes, and free its place in the queue.
+
+    Args:
+        in_flight (BoundedSemaphore): Semaphore limiting the queued images.
+        image_path (Path): Path of the processed image.
+        future (Future): Finished future of the image.
+    """
+    try:
+        future.result()
+    except Exception as e:
+        print(f"Error processing {image_path}: {str(e)}")
+    finally:
+        in_flight.release()
+
+
+def process_stdin_images(process_config: ProcessConfig, workers: int = 2) -> None:
+    """Process images whose paths are read from stdin, one path per line,
+    until stdin is closed. This keeps one Python process (and its imports)
+    alive for many images instead of starting the script once per image.
+    Images are processed by a few threads, so reading and writing one image
+    overlaps with decoding / resizing another (Pillow releases the GIL while
+    it works on pixels). At most twice as many images as threads are queued,
+    so stdin is only read as fast as the images are processed. An image that
+    fails to process is reported as soon as it fails and skipped.
+
+    Args:
+        process_config (ProcessConfig): ProcessConfig instance used for every
+            image. `image_path` is replaced by each path read from stdin.
+        workers (int, optional): Number of threads. Defaults to 2.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from threading import BoundedSemaphore
+
+    in_flight = BoundedSemaphore(workers * 2)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for image_path in _read_stdin_image_paths():
+            in_flight.acquire()
+            future = executor.submit(
+                process_image,
+                process_config=replace(process_config, image_path=image_path),
+            )
+            future.add_done_callback(
+                partial(_report_stdin_result, in_flight, image_path)
+            )
+
+
+def has_glob_pattern(source: str) -> bool:
+    """Check if a source path is a glob pattern (ex: "images/*.png").
+
+    Args:
+        source (str): Source path from the command line.
+
+    Returns:
+        bool: True if the path has any glob wildcard characters.
+    """
+    return any(char in source for char in "*?[")
+
+
 def main():
     """Main function of the script."""
     parser = argparse.ArgumentParser(
@@ -433,6 +808,14 @@ def main():
         formatter_class=argparse.RawTextHelpFormatter,
     )
     add_process_image_args(parser=parser)
+    parser.add_argument(
+        "--workers",
+        "-w",
+        type=int,
+        help="Number of worker processes when --source is a directory or glob "
+        "pattern (default: number of CPUs), or threads when it is - (default: 2).\n"
+        "Only the file name of a glob pattern may contain wildcards",
+    )
 
     args = parser.parse_args()
 
@@ -442,10 +825,32 @@ def main():
     )
 
     process_config = ProcessConfig()
-    process_config.final_image_dims = DimensionsDict(width=width, height=height)
+    process_config.final_image_dims = Dimensions(width=width, height=height)
     process_config.img_config = img_config
     process_config = update_processconfig_from_args(config=process_config, args=args)
-    process_image(process_config=process_config)
+
+    if args.source == "-":
+        process_stdin_images(process_config=process_config, workers=args.workers or 2)
+    elif process_config.image_path.is_dir() or (
+        not process_config.image_path.exists() and has_glob_pattern(args.source)
+    ):
+        if process_config.image_path.is_dir():
+            image_paths = get_image_paths(source_dir=process_config.image_path)
+        else:
+            # the Windows shell doesn't expand wildcards, so expand them here
+            image_paths = get_image_paths(
+                source_dir=process_config.image_path.parent,
+                pattern=process_config.image_path.name,
+            )
+        if not image_paths:
+            print(f"No images match {args.source}")
+            sys.exit(1)
+        process_configs = [
+            replace(process_config, image_path=image_path) for image_path in image_paths
+        ]
+        process_images(process_configs=process_configs, workers=args.workers)
+    else:
+        process_image(process_config=process_config)
 
 
 if __name__ == "__main__":
@@ -1,23 +1,49 @@
 """Utility functions for repo"""
 
+import mmap
 import os
+import re
 from argparse import ArgumentParser, Namespace
 from dataclasses import dataclass
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Literal, Optional, Tuple, TypedDict
-
-import yaml
+from typing import (
+    Any,
+    Dict,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
 from src.constants import (
+    BACKENDS,
+    BACKENDS_HELP,
     IMAGE_CONFIG_PATH,
+    IMG_EXTENSIONS,
     TEXT_OVERLAY_IMAGE_DIR,
     IMG_POSITIONS,
     IMG_POSITIONS_HELP,
+    RESAMPLE_FILTERS,
+    RESAMPLE_FILTERS_HELP,
     TEXT_POSITIONS,
     TEXT_POSITIONS_HELP,
 )
 
+# Config files smaller than this are read normally instead of memory mapped
+_MMAP_MIN_SIZE = 4096
+
+# Image config key of the dimensions of each image type
+_IMG_DIMS_CONFIG_KEYS = {
+    "target": "target_img_dims",
+    "text_overlay": "text_overlay_img_dims",
+}
+
+# A KEY=value line of the config file, lines starting with "#" never match
+_CONFIG_LINE_RE = re.compile(rb"^([A-Za-z_][A-Za-z0-9_]*)=([^\r\n]*)", re.MULTILINE)
+
 
 def add_process_image_args(parser: ArgumentParser) -> None:
     """Add arguments used by process_image.py to an existing parser."""
@@ -73,9 +99,33 @@ def add_process_image_args(parser: ArgumentParser) -> None:
         help=TEXT_POSITIONS_HELP,
         metavar="TEXT_POSITION",
     )
+    parser.add_argument(
+        "--resample",
+        "-r",
+        choices=RESAMPLE_FILTERS,
+        default="bicubic",
+        help=RESAMPLE_FILTERS_HELP,
+        metavar="RESAMPLE",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_const",
+        const="bilinear",
+        dest="resample",
+        help="Shortcut for `--resample bilinear`, for quick previews.",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="pillow",
+        help=BACKENDS_HELP,
+        metavar="BACKEND",
+    )
 
 
-def add_move_file_args(parser: ArgumentParser, require_source: bool = True) -> None:
+def add_move_file_args(
+    parser: ArgumentParser, require_source: bool = True, add_move: bool = True
+) -> None:
     """Add arguments used by move_file.py to an existing parser."""
     if require_source:
         parser.add_argument(
@@ -91,10 +141,51 @@ def add_move_file_args(parser: ArgumentParser, require_source: bool = True) -> N
         action="store_true",
         help="Overwrite existing file if it exists",
     )
+    if add_move:
+        parser.add_argument(
+            "--move",
+            "-m",
+            action="store_true",
+            help="Move the file instead of copying it (the source file is removed)",
+        )
+
+
+@lru_cache(maxsize=4)
+def _parse_config_yaml(
+    yaml_config_path: str, mtime_ns: int, size: int
+) -> Dict[str, int]:
+    """Parse a yaml file into a dict. Cached on the path, modification time
+    and size, so the file is only parsed again after it changes.
+
+    Args:
+        yaml_config_path (str): yaml path.
+        mtime_ns (int): Modification time of the yaml file, only used as
+            part of the cache key.
+        size (int): Size of the yaml file in bytes, only used as part of the
+            cache key (catches edits within the file system's mtime
+            resolution).
+
+    Returns:
+        Dict[str, int]: Config dict.
+    """
+    # yaml is imported here so scripts that never read the image config (like
+    # move_file.py) don't pay for importing it
+    import yaml
+
+    try:
+        # libyaml's C loader, much faster than the pure Python one
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:  # PyYAML built without libyaml
+        from yaml import SafeLoader
+
+    with open(yaml_config_path, "rb") as f:
+        config = yaml.load(f, Loader=SafeLoader)
+    return config
 
 
 def load_config_yaml(yaml_config_path: Path) -> Dict[str, int]:
-    """Load a yaml file into a dict.
+    """Load a yaml file into a dict. The dict is shared between calls and
+    must not be modified.
 
     Args:
         yaml_config_path (Path): yaml path.
@@ -102,9 +193,12 @@ def load_config_yaml(yaml_config_path: Path) -> Dict[str, int]:
     Returns:
         Dict[str, int]: Config dict.
     """
-    with open(yaml_config_path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
-    return config
+    stat_result = os.stat(yaml_config_path)
+    return _parse_config_yaml(
+        yaml_config_path=str(yaml_config_path),
+        mtime_ns=stat_result.st_mtime_ns,
+        size=stat_result.st_size,
+    )
 
 
 def validate_config_dimensions(
@@ -144,27 +238,47 @@ def validate_img_dimensions(
         raise ValueError(f"Text overlay must be {target_size[0]}x{target_size[1]}")
 
 
-def load_image_config() -> Dict[str, int]:
-    """Load the image config dict and verify dimensions.
+@lru_cache(maxsize=1)
+def _load_image_config(mtime_ns: int, size: int) -> Dict[str, int]:
+    """Load the image config dict and verify dimensions. Cached on the
+    modification time and size of the image config file, so it is only
+    loaded and validated again after the file changes.
+
+    Args:
+        mtime_ns (int): Modification time of the image config file, only
+            used as part of the cache key.
+        size (int): Size of the image config file in bytes, only used as
+            part of the cache key.
 
     Returns:
         Dict[str, int]: Image config dict.
     """
     image_config = load_config_yaml(yaml_config_path=IMAGE_CONFIG_PATH)
-    image_width, image_height = get_image_dimensions_from_config(
-        img_config=image_config, img_type="target"
-    )
-    # validate target image dimensions
-    validate_config_dimensions(img_width=image_width, img_height=image_height)
-    # validate text overlay image dimensions
-    image_width, image_height = get_image_dimensions_from_config(
-        img_config=image_config, img_type="text_overlay"
-    )
-    validate_config_dimensions(img_width=image_width, img_height=image_height)
+    # validate target and text overlay image dimensions
+    for img_type in _IMG_DIMS_CONFIG_KEYS:
+        image_width, image_height = get_image_dimensions_from_config(
+            img_config=image_config, img_type=img_type
+        )
+        validate_config_dimensions(
+            img_width=image_width, img_height=image_height, img_type=img_type
+        )
 
     return image_config
 
 
+def load_image_config() -> Dict[str, int]:
+    """Load the image config dict and verify dimensions. The dict is shared
+    between calls and must not be modified.
+
+    Returns:
+        Dict[str, int]: Image config dict.
+    """
+    stat_result = os.stat(IMAGE_CONFIG_PATH)
+    return _load_image_config(
+        mtime_ns=stat_result.st_mtime_ns, size=stat_result.st_size
+    )
+
+
 def get_image_dimensions_from_config(
     img_config: Dict[str, int], img_type: str = "target"
 ) -> Tuple[int, int]:
@@ -178,31 +292,28 @@ def get_image_dimensions_from_config(
     Returns:
         Tuple[int, int]: width, height tuple.
     """
-    if img_type == "target":
-        dict_key = "target_img_dims"
-    else:
-        dict_key = "text_overlay_img_dims"
-    width = img_config[dict_key]["width"]
-    height = img_config[dict_key]["height"]
-    return width, height
+    dims = img_config[_IMG_DIMS_CONFIG_KEYS.get(img_type, "text_overlay_img_dims")]
+    return dims["width"], dims["height"]
 
 
-class DimensionsDict(TypedDict):
-    """DimensionsDict class.
+class Dimensions(NamedTuple):
+    """Dimensions class. Being a tuple, it can be passed directly to PIL
+    functions that take a (width, height) size.
 
     Args:
-        TypedDict (Dict): Width and height of final dimensions.
+        NamedTuple (Tuple[int, int]): Width and height of final dimensions.
     """
 
     width: int
     height: int
 
 
-class CoordinateDict(TypedDict):
-    """CoordinateDict class.
+class Coordinates(NamedTuple):
+    """Coordinates class. Being a tuple, it can be passed directly to PIL
+    functions that take an (x, y) position.
 
     Args:
-        TypedDict (Dict): x and y positions.
+        NamedTuple (Tuple[int, int]): x and y positions.
     """
 
     x: int
@@ -227,16 +338,16 @@ class TextPosition(Enum):
     LOWER_RIGHT = "lower_right"
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessConfig:
     """
     image_path (Path): Full path to image file.
         Defaults to None.
-    final_image_dims (DimensionsDict): Final image dimensions dict.
+    final_image_dims (Dimensions): Final image dimensions.
         Defaults to None.
     img_config (Dict[str, int]): Image config values.
         Defaults to None.
-    text_image_dims (DimensionsDict): Text overlay image dimensions dict.
+    text_image_dims (Dimensions): Text overlay image dimensions.
         Defaults to None.
     crop_position (Literal["center", "left", "right", "top", "bottom"], optional): Determine
         where to crop the image relative to. Defaults to "center".
@@ -248,12 +359,16 @@ class ProcessConfig:
         Defaults to None.
     is_inverted (bool, optional): If True, invert the text image colors.
         Defaults to False.
+    resample (Literal["bicubic", "lanczos", "bilinear"], optional): Resampling
+        filter used to resize the image. Defaults to "bicubic".
+    backend (Literal["pillow", "vips"], optional): Library used to load, crop
+        and resize the image. Defaults to "pillow".
     """
 
     image_path: Path = None
-    final_image_dims: DimensionsDict = None
+    final_image_dims: Dimensions = None
     img_config: Dict[str, int] = None
-    text_image_dims: DimensionsDict = None
+    text_image_dims: Dimensions = None
     crop_position: Literal["center", "left", "right", "top", "bottom"] = "center"
     border_width: Optional[int] = None
     save_path: Optional[Path] = None
@@ -268,9 +383,11 @@ class ProcessConfig:
         "lower_left",
         "lower_right",
     ] = "lower_right"
+    resample: Literal["bicubic", "lanczos", "bilinear"] = "bicubic"
+    backend: Literal["pillow", "vips"] = "pillow"
 
 
-@dataclass
+@dataclass(slots=True)
 class MoveConfig:
     """
     destination_path (Path): Destination file path.
@@ -278,10 +395,14 @@ class MoveConfig:
     is_overwritable (bool, optional): If False, raise an exception if
         the file exists. If True, write the file regardless.
         Defaults to False.
+    keep_source (bool, optional): If True, copy the source file. If False,
+        move it so the source file is removed.
+        Defaults to True.
     """
 
     destination_path: Path = None
     is_overwritable: bool = False
+    keep_source: bool = True
 
 
 def update_processconfig_from_args(
@@ -304,6 +425,8 @@ def update_processconfig_from_args(
     config.is_inverted = args.invert
     config.image_buffer = args.text_buffer
     config.text_position = TextPosition(args.text_position)
+    config.resample = args.resample
+    config.backend = args.backend
     return config
 
 
@@ -332,6 +455,73 @@ class ConfigKey(Enum):
     DESTINATION_DIR = "DESTINATION_DIR"
 
 
+def _scan_config(buffer: bytes) -> Dict[str, str]:
+    """Find every KEY=value line of the config file contents with a single
+    regex scan.
+
+    Args:
+        buffer (bytes): Config file contents (bytes or a memory map).
+
+    Returns:
+        Dict[str, str]: Config values by key.
+    """
+    return {
+        match.group(1).decode("utf-8"): match.group(2).decode("utf-8").strip()
+        for match in _CONFIG_LINE_RE.finditer(buffer)
+    }
+
+
+@lru_cache(maxsize=8)
+def _parse_config(config_path: str, mtime_ns: int, size: int) -> Dict[str, str]:
+    """Parse every KEY=value line of the config file, skipping comments.
+    Files of at least `_MMAP_MIN_SIZE` bytes are memory mapped and scanned
+    straight from the page cache, smaller files are read normally since
+    mapping them costs more than it saves. Cached on the path and
+    modification time, so the file is only read again after it changes.
+
+    Args:
+        config_path (str): Path to config file.
+        mtime_ns (int): Modification time of the config file, only used as
+            part of the cache key.
+        size (int): Size of the config file in bytes.
+
+    Returns:
+        Dict[str, str]: Config values by key.
+    """
+    if size < _MMAP_MIN_SIZE:
+        return _scan_config(Path(config_path).read_bytes())
+    with open(config_path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        return _scan_config(mapped)
+
+
+def load_config(config_path: Path) -> Dict[str, str]:
+    """Load all values of the config file.
+
+    Args:
+        config_path (Path): Path to config file.
+
+    Raises:
+        FileNotFoundError: Raised if the config file does not
+            exist.
+
+    Returns:
+        Dict[str, str]: Config values by key.
+    """
+    try:
+        stat_result = os.stat(config_path)
+    except FileNotFoundError as e:
+        raise FileNotFoundError(
+            f"{config_path} file was not found! Please create it (see README)."
+        ) from e
+    return _parse_config(
+        config_path=str(config_path),
+        mtime_ns=stat_result.st_mtime_ns,
+        size=stat_result.st_size,
+    )
+
+
 def get_config_path(config_path: Path, config_key: ConfigKey) -> Any:
     """Read in the path value of a config key from
     the config file.
@@ -349,22 +539,11 @@ def get_config_path(config_path: Path, config_key: ConfigKey) -> Any:
     Returns:
         Path: Path of config key / value.
     """
-    if not os.path.exists(config_path):
-        raise FileNotFoundError(
-            f"{config_path} file was not found! Please create it (see README)."
-        )
-    with open(config_path, "r", encoding="utf-8") as file:
-        lines = file.readlines()
-    config_path = None
-    no_key = True
-    for line in lines:
-        if line.startswith(f"{config_key.value}="):
-            no_key = False
-            config_path = line.split("=", 1)[1].strip()
-    if no_key:
+    config = load_config(config_path=config_path)
+    if config_key.value not in config:
         raise KeyError(f"Config key ({config_key.value}) not found.")
 
-    return Path(config_path)
+    return Path(config[config_key.value])
 
 
 def get_text_overlay_path(text_overlay_filename: str):
@@ -379,17 +558,39 @@ def get_text_overlay_path(text_overlay_filename: str):
     Returns:
         Path: Path of text overlay file.
     """
-    if text_overlay_filename is None:
+    if not text_overlay_filename:
         return None
-    text_overlay_filepath = None
-    if text_overlay_filename:
-        text_overlay_filepath = os.path.join(
-            TEXT_OVERLAY_IMAGE_DIR, text_overlay_filename
-        )
-    if not os.path.exists(text_overlay_filepath):
+    text_overlay_filepath = TEXT_OVERLAY_IMAGE_DIR / text_overlay_filename
+    # a single stat, the file itself is only opened once the overlay is used
+    if not text_overlay_filepath.is_file():
         err_msg = (
             f"{text_overlay_filepath} does not exist. "
             + "Please add it or choose a different file."
         )
         raise FileNotFoundError(err_msg)
-    return Path(text_overlay_filepath)
+    return text_overlay_filepath
+
+
+def get_image_paths(
+    source_dir: Path, processed_txt: str = "_processed", pattern: str = "*"
+) -> List[Path]:
+    """Get the paths of the unprocessed image files in a directory.
+
+    Args:
+        source_dir (Path): Directory to search for image files.
+        processed_txt (str, optional): Text appended to processed file names.
+            Files with this text at the end of their name are skipped.
+            Defaults to "_processed".
+        pattern (str, optional): Glob pattern file names must match.
+            Defaults to "*".
+
+    Returns:
+        List[Path]: Sorted list of image paths.
+    """
+    return sorted(
+        path
+        for path in Path(source_dir).glob(pattern)
+        if path.suffix.lower() in IMG_EXTENSIONS
+        and not path.stem.endswith(processed_txt)
+        and path.is_file()
+    )